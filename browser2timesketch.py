@@ -19,9 +19,118 @@ import sqlite3
 import csv
 import argparse
 import sys
+import heapq
+import gzip
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Tuple, Optional, Dict, Any, List
+from typing import Tuple, Optional, Dict, Any, List, Iterable, Iterator, Set, TextIO, Callable
+from urllib.parse import quote
+
+try:
+    import zstandard  # optional, only needed for .zst output
+except ImportError:
+    zstandard = None
+
+
+# Event descriptors shared by the page visit extractors of all browsers
+VISIT_TIMESTAMP_DESC = 'Visit Time'
+VISIT_DATA_TYPE = 'browser:page:visit'
+
+# Placeholder for pages without a title
+NO_TITLE = "(No title)"
+
+# Lookup tables for numeric type/state columns
+# Core transition types are contiguous from 0, so they are indexed by position
+CHROMIUM_TRANSITION_TYPES = (
+    "Link", "Typed", "Auto_Bookmark", "Auto_Subframe",
+    "Manual_Subframe", "Generated", "Start_Page",
+    "Form_Submit", "Reload", "Keyword", "Keyword_Generated"
+)
+
+CHROMIUM_DOWNLOAD_STATES = {
+    0: "In Progress",
+    1: "Complete",
+    2: "Cancelled",
+    3: "Interrupted",
+    4: "Dangerous"
+}
+
+GECKO_VISIT_TYPES = {
+    1: "Link", 2: "Typed", 3: "Bookmark", 4: "Embed",
+    5: "Redirect_Permanent", 6: "Redirect_Temporary",
+    7: "Download", 8: "Framed_Link", 9: "Reload"
+}
+
+GECKO_DOWNLOAD_STATES = {
+    0: "Downloading",
+    1: "Complete",
+    2: "Failed",
+    3: "Cancelled",
+    4: "Paused"
+}
+
+GECKO_BOOKMARK_TYPES = {
+    1: "Bookmark",
+    2: "Folder",
+    3: "Separator"
+}
+
+# Tables that identify each browser's history database, checked in order
+BROWSER_SIGNATURE_TABLES = (
+    ('gecko', frozenset({'moz_historyvisits', 'moz_places'})),
+    ('chromium', frozenset({'visits', 'urls'})),
+    ('webkit', frozenset({'history_visits', 'history_items'})),
+)
+
+# Chromium timestamps are microseconds since 1601-01-01
+CHROMIUM_EPOCH_OFFSET_US = 11644473600 * 1000000
+
+# WebKit timestamps are seconds since 2001-01-01
+WEBKIT_EPOCH_OFFSET = 978307200
+
+# Plausible timestamp range (Unix microseconds, UTC) enforced by validate_timestamp()
+MIN_VALID_MICROSECONDS = int(datetime(1990, 1, 1, tzinfo=timezone.utc).timestamp()) * 1000000
+MAX_VALID_MICROSECONDS = int(datetime(2040, 1, 1, tzinfo=timezone.utc).timestamp()) * 1000000
+
+# Raw WebKit timestamp range accepted by validate_timestamp()
+WEBKIT_MIN_TIMESTAMP = MIN_VALID_MICROSECONDS // 1000000 - WEBKIT_EPOCH_OFFSET
+WEBKIT_MAX_TIMESTAMP = MAX_VALID_MICROSECONDS // 1000000 - WEBKIT_EPOCH_OFFSET
+
+# Fields present on every event row
+COMMON_FIELDS = ('timestamp', 'datetime', 'timestamp_desc', 'message', 'data_type', 'browser')
+
+# Connection tuning for the large read-only extraction queries
+SQLITE_READ_PRAGMAS = (
+    'PRAGMA query_only = 1',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -262144',      # 256 MiB page cache
+    'PRAGMA mmap_size = 30000000000',   # capped by SQLite's compile-time maximum
+)
+
+# Sort key for event rows
+timestamp_key = itemgetter('timestamp')
+
+# CSV output is written through a 1 MiB buffer, in chunks of rows
+CSV_BUFFER_SIZE = 1024 * 1024
+CSV_CHUNK_ROWS = 10000
+
+# Minimum seconds between progress updates while writing
+PROGRESS_INTERVAL = 0.25
+
+# Output compression: file suffix per --compress choice, and the levels used
+COMPRESSION_SUFFIXES = {'gz': '.gz', 'zst': '.zst'}
+GZIP_COMPRESS_LEVEL = 1
+ZSTD_COMPRESS_LEVEL = 3
+
+# Worker threads that collect the smaller, unordered extractors in parallel
+EXTRACTOR_THREADS = 4
 
 
 class BrowserDetectionError(Exception):
@@ -39,13 +148,28 @@ class TimestampValidationError(Exception):
     pass
 
 
-def validate_sqlite_database(db_path: str) -> None:
+def readonly_uri(db_path: str) -> str:
+    """
+    Build a read-only SQLite URI for a database path.
+    
+    The path is percent-encoded, so names containing '?', '#' or '%'
+    (common in evidence exports) are not misread as URI parameters. The
+    URI has no authority part, so Windows UNC share paths stay in the path;
+    SQLite rejects file://server/ authorities by default.
+    """
+    return 'file:' + quote(os.path.abspath(db_path), safe='/\\:') + '?mode=ro'
+
+
+def validate_sqlite_database(db_path: str) -> sqlite3.Connection:
     """
     Validate that the file is a SQLite database and is accessible.
     
     Args:
         db_path: Path to database file
         
+    Returns:
+        The validated read-only connection, for reuse by detection and extraction
+        
     Raises:
         DatabaseValidationError: If validation fails
     """
@@ -58,23 +182,27 @@ def validate_sqlite_database(db_path: str) -> None:
         raise DatabaseValidationError(f"Path is not a file: {db_path}")
     
     # Try to open as SQLite database
+    conn = None
     try:
-        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1")
-        conn.close()
-    except sqlite3.DatabaseError as e:
-        raise DatabaseValidationError(f"Not a valid SQLite database: {db_path}. Error: {e}")
+        conn = connect_database_readonly(db_path)
+        conn.execute("SELECT name FROM sqlite_master WHERE type='table' LIMIT 1")
+        return conn
     except sqlite3.OperationalError as e:
+        if conn is not None:
+            conn.close()
         raise DatabaseValidationError(f"Cannot access database (may be locked or corrupted): {db_path}. Error: {e}")
+    except sqlite3.DatabaseError as e:
+        if conn is not None:
+            conn.close()
+        raise DatabaseValidationError(f"Not a valid SQLite database: {db_path}. Error: {e}")
 
 
-def detect_browser_type(db_path: str) -> str:
+def detect_browser_type(conn: sqlite3.Connection) -> str:
     """
     Auto-detect browser type by examining database schema.
     
     Args:
-        db_path: Path to database file
+        conn: Connection returned by validate_sqlite_database()
         
     Returns:
         Detected browser type: 'gecko', 'chromium', or 'webkit'
@@ -83,22 +211,14 @@ def detect_browser_type(db_path: str) -> str:
         BrowserDetectionError: If browser type cannot be determined
     """
     try:
-        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
         cursor = conn.cursor()
         
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
         tables = {row[0] for row in cursor.fetchall()}
         
-        conn.close()
-        
-        if 'moz_historyvisits' in tables and 'moz_places' in tables:
-            return 'gecko'
-        
-        if 'visits' in tables and 'urls' in tables:
-            return 'chromium'
-        
-        if 'history_visits' in tables and 'history_items' in tables:
-            return 'webkit'
+        for browser_type, required_tables in BROWSER_SIGNATURE_TABLES:
+            if required_tables <= tables:
+                return browser_type
         
         raise BrowserDetectionError(
             f"Cannot determine browser type. Found tables: {', '.join(sorted(tables))}"
@@ -119,31 +239,54 @@ def validate_timestamp(unix_microseconds: int, browser_type: str) -> None:
     Raises:
         TimestampValidationError: If timestamp is unreasonable
     """
-    if unix_microseconds <= 0:
+    # 0 means "no timestamp"; negative values are rejected as too old
+    if unix_microseconds == 0:
         return
     
-    timestamp_seconds = unix_microseconds / 1000000
-    
-    min_date = datetime(1990, 1, 1)
-    max_date = datetime(2040, 1, 1)
-    min_seconds = min_date.timestamp()
-    max_seconds = max_date.timestamp()
-    
-    if timestamp_seconds < min_seconds:
-        dt = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
+    # Pure integer comparisons; datetime objects are only built for the error message
+    if unix_microseconds < MIN_VALID_MICROSECONDS:
+        dt = datetime.fromtimestamp(unix_microseconds / 1000000, tz=timezone.utc)
         raise TimestampValidationError(
             f"Timestamp appears too old: {dt.strftime('%Y-%m-%d %H:%M:%S')} (before 1990). "
             f"This may indicate a timestamp conversion error for {browser_type}."
         )
     
-    if timestamp_seconds > max_seconds:
-        dt = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
+    if unix_microseconds > MAX_VALID_MICROSECONDS:
+        dt = datetime.fromtimestamp(unix_microseconds / 1000000, tz=timezone.utc)
         raise TimestampValidationError(
             f"Timestamp appears to be in the future: {dt.strftime('%Y-%m-%d %H:%M:%S')} (after 2040). "
             f"This may indicate a timestamp conversion error for {browser_type}."
         )
 
 
+@lru_cache(maxsize=4096)
+def format_iso_date(days: int) -> str:
+    """
+    Format days since the Unix epoch as YYYY-MM-DD.
+    
+    Integer civil-from-days conversion (H. Hinnant), cached because events
+    cluster on relatively few distinct days.
+    """
+    z = days + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+def format_iso_datetime(unix_microseconds: int) -> str:
+    """Format Unix microseconds as an ISO 8601 UTC string (second precision)."""
+    days, seconds = divmod(int(unix_microseconds // 1000000), 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{format_iso_date(days)}T{hours:02d}:{minutes:02d}:{seconds:02d}+00:00"
+
+
 def convert_gecko_timestamp(gecko_timestamp: Optional[int]) -> Tuple[int, str]:
     """Convert Gecko/Firefox timestamp to Unix microseconds and ISO format."""
     if gecko_timestamp is None or gecko_timestamp == 0:
@@ -151,9 +294,7 @@ def convert_gecko_timestamp(gecko_timestamp: Optional[int]) -> Tuple[int, str]:
     
     validate_timestamp(gecko_timestamp, "Gecko/Firefox")
     
-    timestamp_seconds = gecko_timestamp / 1000000
-    dt = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
-    return gecko_timestamp, dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    return gecko_timestamp, format_iso_datetime(gecko_timestamp)
 
 
 def convert_chromium_timestamp(chromium_timestamp: Optional[int]) -> Tuple[int, str]:
@@ -161,14 +302,12 @@ def convert_chromium_timestamp(chromium_timestamp: Optional[int]) -> Tuple[int,
     if chromium_timestamp is None or chromium_timestamp == 0:
         return 0, ""
     
-    chromium_epoch_offset = 11644473600
-    timestamp_seconds = (chromium_timestamp / 1000000) - chromium_epoch_offset
-    unix_microseconds = int(timestamp_seconds * 1000000)
+    # Integer arithmetic keeps full microsecond precision (values exceed 2**53)
+    unix_microseconds = int(chromium_timestamp) - CHROMIUM_EPOCH_OFFSET_US
     
     validate_timestamp(unix_microseconds, "Chromium")
     
-    dt = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
-    return unix_microseconds, dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    return unix_microseconds, format_iso_datetime(unix_microseconds)
 
 
 def convert_webkit_timestamp(webkit_timestamp: Optional[float]) -> Tuple[int, str]:
@@ -176,31 +315,33 @@ def convert_webkit_timestamp(webkit_timestamp: Optional[float]) -> Tuple[int, st
     if webkit_timestamp is None or webkit_timestamp == 0:
         return 0, ""
     
-    webkit_epoch_offset = 978307200
-    timestamp_seconds = webkit_timestamp + webkit_epoch_offset
+    timestamp_seconds = webkit_timestamp + WEBKIT_EPOCH_OFFSET
     unix_microseconds = int(timestamp_seconds * 1000000)
     
     validate_timestamp(unix_microseconds, "WebKit/Safari")
     
-    dt = datetime.fromtimestamp(timestamp_seconds, tz=timezone.utc)
-    return unix_microseconds, dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+    return unix_microseconds, format_iso_datetime(unix_microseconds)
 
 
-def write_timesketch_csv(output_csv: str, rows: List[Dict[str, Any]]) -> None:
+def download_filename(path: Optional[str]) -> str:
+    """Return the file name part of a download path recorded on any OS."""
+    if not path:
+        return "(unknown)"
+    # Split on both separators: profiles from Windows hosts store backslash paths
+    return path.rsplit('/', 1)[-1].rsplit('\\', 1)[-1]
+
+
+def build_fieldnames(all_fields: Iterable[str]) -> List[str]:
     """
-    Write history data to Timesketch-compatible CSV format with dynamic fields.
+    Order CSV columns: standard Timesketch fields first, then the rest alphabetically.
     
     Args:
-        output_csv: Path to output CSV file
-        rows: List of row dictionaries to write
+        all_fields: Every field name emitted by any row
+        
+    Returns:
+        Ordered list of field names for the CSV header
     """
-    if not rows:
-        return
-    
-    # Collect all unique fields from all rows
-    all_fields = set()
-    for row in rows:
-        all_fields.update(row.keys())
+    all_fields = set(all_fields)
     
     # Define standard field order (these come first)
     standard_fields = ['timestamp', 'datetime', 'timestamp_desc', 'message', 'data_type']
@@ -210,18 +351,85 @@ def write_timesketch_csv(output_csv: str, rows: List[Dict[str, Any]]) -> None:
     remaining_fields = sorted(all_fields - set(standard_fields))
     fieldnames.extend(remaining_fields)
     
-    with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        
-        for row in rows:
-            writer.writerow(row)
+    return fieldnames
+
+
+def output_compression(output_csv: str) -> str:
+    """Infer the compression ('none', 'gz' or 'zst') from the output file extension."""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if output_csv.endswith(suffix):
+            return compression
+    return 'none'
+
+
+def open_output_file(output_csv: str, compression: Optional[str] = None) -> TextIO:
+    """
+    Open the output CSV for writing, compressing it on the fly.
+    
+    'gz' writes gzip and 'zst' writes Zstandard (requires the zstandard
+    package); 'none' writes plain text. By default the compression is
+    inferred from the file extension.
+    """
+    if compression is None:
+        compression = output_compression(output_csv)
+    
+    if compression == 'gz':
+        return gzip.open(output_csv, 'wt', newline='', encoding='utf-8', compresslevel=GZIP_COMPRESS_LEVEL)
+    
+    if compression == 'zst':
+        compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL, threads=-1)
+        raw = open(output_csv, 'wb', buffering=CSV_BUFFER_SIZE)
+        return io.TextIOWrapper(compressor.stream_writer(raw), newline='', encoding='utf-8')
+    
+    return open(output_csv, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+
+
+def write_timesketch_csv(output_csv: str, rows: Iterable[Dict[str, Any]], fieldnames: List[str],
+                         compression: Optional[str] = None,
+                         progress: Optional[Callable[[int], None]] = None) -> None:
+    """
+    Write history data to Timesketch-compatible CSV format with dynamic fields.
+    
+    Rows are streamed straight to the file, so the caller can pass a lazy
+    iterator instead of a materialized list.
+    
+    Args:
+        output_csv: Path to output CSV file
+        rows: Iterable of row dictionaries to write
+        fieldnames: Column order, see build_fieldnames()
+        compression: 'none', 'gz' or 'zst' (default: inferred from output_csv)
+        progress: Optional callback given the number of rows written so far,
+            called at most every PROGRESS_INTERVAL seconds
+    """
+    with open_output_file(output_csv, compression) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
+        
+        # Plain writer over pre-ordered values avoids DictWriter's per-row key checks
+        values = ([row.get(field, '') for field in fieldnames] for row in rows)
+        written = 0
+        last_report = time.monotonic()
+        while True:
+            chunk = list(islice(values, CSV_CHUNK_ROWS))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            written += len(chunk)
+            
+            # Checked once per chunk, so the clock is never read per row
+            if progress is not None:
+                now = time.monotonic()
+                if now - last_report >= PROGRESS_INTERVAL:
+                    progress(written)
+                    last_report = now
 
 
 def connect_database_readonly(db_path: str) -> sqlite3.Connection:
     """Connect to database in read-only mode to avoid lock issues."""
     try:
-        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        conn = sqlite3.connect(readonly_uri(db_path), uri=True)
+        for pragma in SQLITE_READ_PRAGMAS:
+            conn.execute(pragma)
         return conn
     except sqlite3.OperationalError as e:
         raise sqlite3.OperationalError(
@@ -231,44 +439,56 @@ def connect_database_readonly(db_path: str) -> sqlite3.Connection:
         )
 
 
-def table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
-    """Check if a table exists in the database."""
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-        (table_name,)
-    )
-    return cursor.fetchone() is not None
-
-
-def column_exists(conn: sqlite3.Connection, table_name: str, column_name: str) -> bool:
-    """Check if a column exists in a table."""
+def load_schema(conn: sqlite3.Connection) -> Dict[str, Set[str]]:
+    """
+    Snapshot the database schema once so extractors can check for tables
+    and columns without issuing their own queries.
+    
+    Returns:
+        Dictionary mapping each table name to the set of its column names.
+        Tables SQLite cannot introspect (e.g. virtual tables whose module is
+        unavailable) map to an empty set, so their column checks fail softly.
+    """
     cursor = conn.cursor()
-    try:
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = {row[1] for row in cursor.fetchall()}
-        return column_name in columns
-    except sqlite3.Error:
-        return False
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    tables = [row[0] for row in cursor.fetchall()]
+    
+    schema = {}
+    for table_name in tables:
+        quoted_name = table_name.replace('"', '""')
+        try:
+            cursor.execute(f'PRAGMA table_info("{quoted_name}")')
+            schema[table_name] = {row[1] for row in cursor.fetchall()}
+        except sqlite3.Error:
+            schema[table_name] = set()
+    
+    return schema
 
 
 # ============================================================================
 # CHROMIUM EXTRACTORS
 # ============================================================================
 
-def extract_chromium_visits(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+CHROMIUM_VISIT_FIELDS = COMMON_FIELDS + (
+    'url', 'title', 'visit_type', 'visit_duration_us', 'total_visits',
+    'typed_count', 'typed_in_omnibox', 'hidden', 'from_url', 'opener_url',
+    'session_id', 'from_title', 'opener_title'
+)
+
+
+def extract_chromium_visits(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract visit events from Chromium database with resolved foreign keys."""
     cursor = conn.cursor()
     
     query = """
     SELECT 
         visits.visit_time,
-        urls.url,
-        urls.title,
+        COALESCE(urls.url, ''),
+        COALESCE(NULLIF(urls.title, ''), ?),
         visits.transition,
-        visits.visit_duration,
-        urls.visit_count,
-        urls.typed_count,
+        COALESCE(visits.visit_duration, 0),
+        COALESCE(urls.visit_count, 0),
+        COALESCE(urls.typed_count, 0),
         visits.segment_id,
         visits.incremented_omnibox_typed_score,
         urls.hidden,
@@ -285,18 +505,11 @@ def extract_chromium_visits(conn: sqlite3.Connection, browser_name: str) -> List
     ORDER BY visits.visit_time
     """
     
-    cursor.execute(query)
-    results = cursor.fetchall()
-    
-    transition_types = {
-        0: "Link", 1: "Typed", 2: "Auto_Bookmark", 3: "Auto_Subframe",
-        4: "Manual_Subframe", 5: "Generated", 6: "Start_Page",
-        7: "Form_Submit", 8: "Reload", 9: "Keyword", 10: "Keyword_Generated"
-    }
+    # URL/title/count defaults are filled in by the query
+    cursor.execute(query, (NO_TITLE,))
     
-    rows = []
-    for row in results:
-        (chromium_timestamp, url, title, transition, visit_duration,
+    for row in cursor:
+        (chromium_timestamp, url, display_title, transition, visit_duration,
          visit_count, typed_count, segment_id, incremented_typed, hidden,
          from_url, from_title, opener_url, opener_title) = row
         
@@ -306,22 +519,25 @@ def extract_chromium_visits(conn: sqlite3.Connection, browser_name: str) -> List
             continue
         
         core_transition = transition & 0xFF
-        transition_name = transition_types.get(core_transition, f"Unknown({core_transition})")
+        if core_transition < len(CHROMIUM_TRANSITION_TYPES):
+            transition_name = CHROMIUM_TRANSITION_TYPES[core_transition]
+        else:
+            transition_name = f"Unknown({core_transition})"
         
         # Build row with only useful fields
         row_data = {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
-            'timestamp_desc': 'Visit Time',
-            'message': f"Visited: {title or '(No title)'}",
-            'data_type': 'browser:page:visit',
+            'timestamp_desc': VISIT_TIMESTAMP_DESC,
+            'message': f"Visited: {display_title}",
+            'data_type': VISIT_DATA_TYPE,
             'browser': browser_name,
-            'url': url or "",
-            'title': title or "(No title)",
+            'url': url,
+            'title': display_title,
             'visit_type': transition_name,
-            'visit_duration_us': visit_duration or 0,
-            'total_visits': visit_count or 0,
-            'typed_count': typed_count or 0,
+            'visit_duration_us': visit_duration,
+            'total_visits': visit_count,
+            'typed_count': typed_count,
             'typed_in_omnibox': bool(incremented_typed),
             'hidden': bool(hidden)
         }
@@ -341,23 +557,26 @@ def extract_chromium_visits(conn: sqlite3.Connection, browser_name: str) -> List
         if segment_id and segment_id != 0:
             row_data['session_id'] = segment_id
         
-        rows.append(row_data)
-    
-    return rows
+        yield row_data
 
 
-def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+CHROMIUM_DOWNLOAD_FIELDS = COMMON_FIELDS + (
+    'download_id', 'filename', 'file_path', 'file_size_bytes', 'mime_type',
+    'download_state', 'referrer_url', 'tab_url', 'dangerous', 'interrupted',
+    'download_duration_seconds'
+)
+
+
+def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract download events from Chromium database."""
-    if not table_exists(conn, 'downloads'):
-        return []
+    if 'downloads' not in schema:
+        return
     
     cursor = conn.cursor()
     
     query = """
     SELECT 
         id,
-        guid,
-        current_path,
         target_path,
         start_time,
         received_bytes,
@@ -366,34 +585,22 @@ def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> L
         danger_type,
         interrupt_reason,
         end_time,
-        opened,
         last_access_time,
         referrer,
         tab_url,
         mime_type
     FROM downloads
-    ORDER BY start_time
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
-    
-    download_states = {
-        0: "In Progress",
-        1: "Complete",
-        2: "Cancelled",
-        3: "Interrupted",
-        4: "Dangerous"
-    }
-    
-    rows = []
-    for row in results:
-        (dl_id, guid, current_path, target_path, start_time, received_bytes,
-         total_bytes, state, danger_type, interrupt_reason, end_time, opened,
-         last_access_time, referrer, tab_url, mime_type) = row
+        return
+    
+    for row in cursor:
+        (dl_id, target_path, start_time, received_bytes, total_bytes, state,
+         danger_type, interrupt_reason, end_time, last_access_time, referrer,
+         tab_url, mime_type) = row
         
         try:
             start_us, start_iso = convert_chromium_timestamp(start_time)
@@ -402,11 +609,11 @@ def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> L
         except TimestampValidationError:
             continue
         
-        state_name = download_states.get(state, f"Unknown({state})")
-        filename = Path(target_path).name if target_path else "(unknown)"
+        state_name = CHROMIUM_DOWNLOAD_STATES.get(state) or f"Unknown({state})"
+        filename = download_filename(target_path)
         
         # Download start event
-        rows.append({
+        yield {
             'timestamp': start_us,
             'datetime': start_iso,
             'timestamp_desc': 'Download Started',
@@ -423,12 +630,12 @@ def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> L
             'tab_url': tab_url or "",
             'dangerous': bool(danger_type),
             'interrupted': bool(interrupt_reason)
-        })
+        }
         
         # Download complete event (if completed)
         if end_time and end_time != start_time:
             duration_seconds = (end_us - start_us) / 1000000
-            rows.append({
+            yield {
                 'timestamp': end_us,
                 'datetime': end_iso,
                 'timestamp_desc': 'Download Completed',
@@ -442,11 +649,11 @@ def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> L
                 'mime_type': mime_type or "",
                 'download_state': state_name,
                 'download_duration_seconds': duration_seconds
-            })
+            }
         
         # Last access event (if different from completion)
         if last_access_time and last_access_time != end_time and last_access_time != start_time:
-            rows.append({
+            yield {
                 'timestamp': access_us,
                 'datetime': access_iso,
                 'timestamp_desc': 'File Accessed',
@@ -456,15 +663,18 @@ def extract_chromium_downloads(conn: sqlite3.Connection, browser_name: str) -> L
                 'download_id': dl_id,
                 'filename': filename,
                 'file_path': target_path or ""
-            })
-    
-    return rows
+            }
+
+
+CHROMIUM_SEARCH_FIELDS = COMMON_FIELDS + (
+    'search_term', 'normalized_search_term', 'search_url', 'search_page_title'
+)
 
 
-def extract_chromium_search_terms(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+def extract_chromium_search_terms(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract search terms from Chromium database."""
-    if not table_exists(conn, 'keyword_search_terms'):
-        return []
+    if 'keyword_search_terms' not in schema:
+        return
     
     cursor = conn.cursor()
     
@@ -477,17 +687,14 @@ def extract_chromium_search_terms(conn: sqlite3.Connection, browser_name: str) -
         u.last_visit_time
     FROM keyword_search_terms kst
     JOIN urls u ON kst.url_id = u.id
-    ORDER BY u.last_visit_time
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         term, normalized_term, url, title, last_visit = row
         
         try:
@@ -495,7 +702,7 @@ def extract_chromium_search_terms(conn: sqlite3.Connection, browser_name: str) -
         except TimestampValidationError:
             continue
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Search Performed',
@@ -506,60 +713,61 @@ def extract_chromium_search_terms(conn: sqlite3.Connection, browser_name: str) -
             'normalized_search_term': normalized_term,
             'search_url': url or "",
             'search_page_title': title or ""
-        })
-    
-    return rows
+        }
+
 
+CHROMIUM_AUTOFILL_FIELDS = COMMON_FIELDS + (
+    'form_field_name', 'form_field_value', 'total_uses'
+)
+
+# Autofill queries keyed by (has date_created, has date_last_used);
+# a missing timestamp column is selected as NULL
+CHROMIUM_AUTOFILL_QUERIES = {
+    (True, True): """
+    SELECT name, value, date_created, date_last_used, count
+    FROM autofill
+    WHERE date_created > 0 OR date_last_used > 0
+    """,
+    (True, False): """
+    SELECT name, value, date_created, NULL, count
+    FROM autofill
+    WHERE date_created > 0
+    """,
+    (False, True): """
+    SELECT name, value, NULL, date_last_used, count
+    FROM autofill
+    WHERE date_last_used > 0
+    """,
+}
 
-def extract_chromium_autofill(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+
+def extract_chromium_autofill(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract autofill/form data from Chromium database."""
-    if not table_exists(conn, 'autofill'):
-        return []
+    if 'autofill' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check which timestamp columns exist
-    has_created = column_exists(conn, 'autofill', 'date_created')
-    has_last_used = column_exists(conn, 'autofill', 'date_last_used')
+    has_created = 'date_created' in schema['autofill']
+    has_last_used = 'date_last_used' in schema['autofill']
     
     if not (has_created or has_last_used):
-        return []
-    
-    # Build query based on available columns
-    timestamp_cols = []
-    if has_created:
-        timestamp_cols.append('date_created')
-    if has_last_used:
-        timestamp_cols.append('date_last_used')
-    
-    query = f"""
-    SELECT 
-        name,
-        value,
-        {', '.join(timestamp_cols)},
-        count
-    FROM autofill
-    WHERE {' OR '.join([f'{col} > 0' for col in timestamp_cols])}
-    ORDER BY {timestamp_cols[0]}
-    """
+        return
     
     try:
-        cursor.execute(query)
-        results = cursor.fetchall()
+        cursor.execute(CHROMIUM_AUTOFILL_QUERIES[has_created, has_last_used])
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
-        name, value, *timestamps, count = row
-        date_created = timestamps[0] if has_created else None
-        date_last_used = timestamps[1] if has_last_used and len(timestamps) > 1 else timestamps[0] if not has_created else None
+    for row in cursor:
+        name, value, date_created, date_last_used, count = row
         
         # Form field created/first used
         if date_created:
             try:
                 created_us, created_iso = convert_chromium_timestamp(date_created)
-                rows.append({
+                yield {
                     'timestamp': created_us,
                     'datetime': created_iso,
                     'timestamp_desc': 'Form Field First Used',
@@ -569,7 +777,7 @@ def extract_chromium_autofill(conn: sqlite3.Connection, browser_name: str) -> Li
                     'form_field_name': name,
                     'form_field_value': value[:50] + '...' if len(value) > 50 else value,
                     'total_uses': count or 0
-                })
+                }
             except TimestampValidationError:
                 pass
         
@@ -577,7 +785,7 @@ def extract_chromium_autofill(conn: sqlite3.Connection, browser_name: str) -> Li
         if date_last_used and date_last_used != date_created:
             try:
                 last_us, last_iso = convert_chromium_timestamp(date_last_used)
-                rows.append({
+                yield {
                     'timestamp': last_us,
                     'datetime': last_iso,
                     'timestamp_desc': 'Form Field Last Used',
@@ -587,21 +795,24 @@ def extract_chromium_autofill(conn: sqlite3.Connection, browser_name: str) -> Li
                     'form_field_name': name,
                     'form_field_value': value[:50] + '...' if len(value) > 50 else value,
                     'total_uses': count or 0
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_chromium_favicons(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+CHROMIUM_FAVICON_FIELDS = COMMON_FIELDS + (
+    'page_url', 'favicon_url'
+)
+
+
+def extract_chromium_favicons(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract favicon mapping timestamps from Chromium database."""
-    if not table_exists(conn, 'icon_mapping'):
-        return []
+    if 'icon_mapping' not in schema:
+        return
     
     # Check if last_updated column exists (not in all Chromium versions)
-    if not column_exists(conn, 'icon_mapping', 'last_updated'):
-        return []
+    if 'last_updated' not in schema['icon_mapping']:
+        return
     
     cursor = conn.cursor()
     
@@ -613,17 +824,14 @@ def extract_chromium_favicons(conn: sqlite3.Connection, browser_name: str) -> Li
     FROM icon_mapping im
     LEFT JOIN favicons f ON im.icon_id = f.id
     WHERE im.last_updated > 0
-    ORDER BY im.last_updated
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         last_updated, page_url, favicon_url = row
         
         try:
@@ -631,7 +839,7 @@ def extract_chromium_favicons(conn: sqlite3.Connection, browser_name: str) -> Li
         except TimestampValidationError:
             continue
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Favicon Updated',
@@ -640,23 +848,26 @@ def extract_chromium_favicons(conn: sqlite3.Connection, browser_name: str) -> Li
             'browser': browser_name,
             'page_url': page_url or "",
             'favicon_url': favicon_url or ""
-        })
-    
-    return rows
+        }
+
 
+CHROMIUM_MEDIA_FIELDS = COMMON_FIELDS + (
+    'media_url', 'watch_time_seconds', 'has_audio', 'has_video'
+)
 
-def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+
+def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract media playback history from Chromium database."""
-    if not table_exists(conn, 'playback'):
-        return []
+    if 'playback' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check available columns
-    has_last_updated = column_exists(conn, 'playback', 'last_updated_time_s')
+    has_last_updated = 'last_updated_time_s' in schema['playback']
     
     if not has_last_updated:
-        return []
+        return
     
     query = """
     SELECT 
@@ -667,17 +878,14 @@ def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str)
         p.last_updated_time_s
     FROM playback p
     WHERE p.last_updated_time_s > 0
-    ORDER BY p.last_updated_time_s
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         url, watch_time, has_audio, has_video, last_updated = row
         
         # Convert Unix seconds to microseconds for consistency
@@ -685,8 +893,7 @@ def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str)
         
         try:
             validate_timestamp(unix_microseconds, "Chromium Media")
-            dt = datetime.fromtimestamp(last_updated, tz=timezone.utc)
-            iso_datetime = dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+            iso_datetime = format_iso_datetime(unix_microseconds)
         except TimestampValidationError:
             continue
         
@@ -697,7 +904,7 @@ def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str)
             media_type.append("video")
         media_type_str = "+".join(media_type) if media_type else "unknown"
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Media Playback',
@@ -708,23 +915,26 @@ def extract_chromium_media_history(conn: sqlite3.Connection, browser_name: str)
             'watch_time_seconds': watch_time or 0,
             'has_audio': bool(has_audio),
             'has_video': bool(has_video)
-        })
-    
-    return rows
+        }
+
 
+CHROMIUM_ENGAGEMENT_FIELDS = COMMON_FIELDS + (
+    'site_url', 'engagement_score'
+)
 
-def extract_chromium_site_engagement(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+
+def extract_chromium_site_engagement(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract site engagement scores from Chromium database."""
-    if not table_exists(conn, 'site_engagement'):
-        return []
+    if 'site_engagement' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for timestamp column
-    has_last_engagement = column_exists(conn, 'site_engagement', 'last_engagement_time')
+    has_last_engagement = 'last_engagement_time' in schema['site_engagement']
     
     if not has_last_engagement:
-        return []
+        return
     
     query = """
     SELECT 
@@ -733,17 +943,14 @@ def extract_chromium_site_engagement(conn: sqlite3.Connection, browser_name: str
         last_engagement_time
     FROM site_engagement
     WHERE last_engagement_time > 0 AND score > 0
-    ORDER BY last_engagement_time
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         origin_url, score, last_engagement = row
         
         # Convert internal timestamp format (typically Unix seconds)
@@ -751,12 +958,11 @@ def extract_chromium_site_engagement(conn: sqlite3.Connection, browser_name: str
         
         try:
             validate_timestamp(unix_microseconds, "Chromium Site Engagement")
-            dt = datetime.fromtimestamp(last_engagement, tz=timezone.utc)
-            iso_datetime = dt.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+            iso_datetime = format_iso_datetime(unix_microseconds)
         except TimestampValidationError:
             continue
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Site Engagement Updated',
@@ -765,29 +971,34 @@ def extract_chromium_site_engagement(conn: sqlite3.Connection, browser_name: str
             'browser': browser_name,
             'site_url': origin_url or "",
             'engagement_score': score or 0
-        })
-    
-    return rows
+        }
 
 
 # ============================================================================
 # GECKO/FIREFOX EXTRACTORS
 # ============================================================================
 
-def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_VISIT_FIELDS = COMMON_FIELDS + (
+    'url', 'title', 'visit_type', 'total_visit_count', 'typed_count',
+    'frecency_score', 'hidden', 'domain', 'description', 'from_url',
+    'session_id', 'from_title'
+)
+
+
+def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract visit events from Gecko database with resolved foreign keys."""
     cursor = conn.cursor()
     
     query = """
     SELECT 
         v.visit_date,
-        p.url,
-        p.title,
+        COALESCE(p.url, ''),
+        COALESCE(NULLIF(p.title, ''), ?),
         p.description,
         v.visit_type,
         v.session,
-        p.visit_count,
-        p.typed,
+        COALESCE(p.visit_count, 0),
+        COALESCE(p.typed, 0),
         p.frecency,
         p.hidden,
         p.rev_host,
@@ -800,18 +1011,11 @@ def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str) -> List[Di
     ORDER BY v.visit_date
     """
     
-    cursor.execute(query)
-    results = cursor.fetchall()
+    # URL/title/count defaults are filled in by the query
+    cursor.execute(query, (NO_TITLE,))
     
-    visit_types = {
-        1: "Link", 2: "Typed", 3: "Bookmark", 4: "Embed",
-        5: "Redirect_Permanent", 6: "Redirect_Temporary",
-        7: "Download", 8: "Framed_Link", 9: "Reload"
-    }
-    
-    rows = []
-    for row in results:
-        (timestamp_us, url, title, description, visit_type_id,
+    for row in cursor:
+        (timestamp_us, url, display_title, description, visit_type_id,
          session, visit_count, typed, frecency, hidden, rev_host,
          from_url, from_title) = row
         
@@ -820,9 +1024,9 @@ def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str) -> List[Di
         except TimestampValidationError:
             continue
         
-        visit_type_name = visit_types.get(visit_type_id, f"Unknown({visit_type_id})")
+        visit_type_name = GECKO_VISIT_TYPES.get(visit_type_id) or f"Unknown({visit_type_id})"
         
-        message = f"Visited: {title or '(No title)'}"
+        message = f"Visited: {display_title}"
         if description:
             message += f" - {description}"
         
@@ -830,15 +1034,15 @@ def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str) -> List[Di
         row_data = {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
-            'timestamp_desc': 'Visit Time',
+            'timestamp_desc': VISIT_TIMESTAMP_DESC,
             'message': message,
-            'data_type': 'browser:page:visit',
+            'data_type': VISIT_DATA_TYPE,
             'browser': browser_name,
-            'url': url or "",
-            'title': title or "(No title)",
+            'url': url,
+            'title': display_title,
             'visit_type': visit_type_name,
-            'total_visit_count': visit_count or 0,
-            'typed_count': typed or 0,
+            'total_visit_count': visit_count,
+            'typed_count': typed,
             'frecency_score': frecency,
             'hidden': bool(hidden),
             'domain': rev_host[::-1] if rev_host else ""
@@ -858,15 +1062,19 @@ def extract_gecko_visits(conn: sqlite3.Connection, browser_name: str) -> List[Di
         if session and session != 0:
             row_data['session_id'] = session
         
-        rows.append(row_data)
-    
-    return rows
+        yield row_data
+
+
+GECKO_BOOKMARK_FIELDS = COMMON_FIELDS + (
+    'bookmark_id', 'bookmark_type', 'bookmark_title', 'url',
+    'parent_folder_id', 'position'
+)
 
 
-def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract bookmark events from Gecko database."""
-    if not table_exists(conn, 'moz_bookmarks'):
-        return []
+    if 'moz_bookmarks' not in schema:
+        return
     
     cursor = conn.cursor()
     
@@ -889,18 +1097,10 @@ def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
-    
-    bookmark_types = {
-        1: "Bookmark",
-        2: "Folder",
-        3: "Separator"
-    }
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         (bm_id, bm_type, title, date_added, last_modified,
          url, page_title, parent, position) = row
         
@@ -909,11 +1109,11 @@ def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List
         except TimestampValidationError:
             continue
         
-        type_name = bookmark_types.get(bm_type, f"Unknown({bm_type})")
-        display_title = title or page_title or "(No title)"
+        type_name = GECKO_BOOKMARK_TYPES.get(bm_type) or f"Unknown({bm_type})"
+        display_title = title or page_title or NO_TITLE
         
         # Bookmark added event
-        rows.append({
+        yield {
             'timestamp': added_us,
             'datetime': added_iso,
             'timestamp_desc': 'Bookmark Added',
@@ -926,13 +1126,13 @@ def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List
             'url': url or "",
             'parent_folder_id': parent,
             'position': position
-        })
+        }
         
         # Bookmark modified event (if different from added)
         if last_modified and last_modified != date_added:
             try:
                 modified_us, modified_iso = convert_gecko_timestamp(last_modified)
-                rows.append({
+                yield {
                     'timestamp': modified_us,
                     'datetime': modified_iso,
                     'timestamp_desc': 'Bookmark Modified',
@@ -942,17 +1142,21 @@ def extract_gecko_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List
                     'bookmark_id': bm_id,
                     'bookmark_title': display_title,
                     'url': url or ""
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_DOWNLOAD_FIELDS = COMMON_FIELDS + (
+    'download_id', 'filename', 'source_url', 'target_path', 'file_size_bytes',
+    'mime_type', 'download_state', 'referrer_url', 'download_duration_seconds'
+)
+
+
+def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract downloads from Gecko database (older Firefox versions)."""
-    if not table_exists(conn, 'moz_downloads'):
-        return []
+    if 'moz_downloads' not in schema:
+        return
     
     cursor = conn.cursor()
     
@@ -971,25 +1175,14 @@ def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str) -> List
         mimeType
     FROM moz_downloads
     WHERE startTime IS NOT NULL
-    ORDER BY startTime
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
-    
-    download_states = {
-        0: "Downloading",
-        1: "Complete",
-        2: "Failed",
-        3: "Cancelled",
-        4: "Paused"
-    }
-    
-    rows = []
-    for row in results:
+        return
+    
+    for row in cursor:
         (dl_id, name, source, target, start_time, end_time, state,
          referrer, curr_bytes, max_bytes, mime_type) = row
         
@@ -998,10 +1191,10 @@ def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str) -> List
         except TimestampValidationError:
             continue
         
-        state_name = download_states.get(state, f"Unknown({state})")
+        state_name = GECKO_DOWNLOAD_STATES.get(state) or f"Unknown({state})"
         
         # Download start event
-        rows.append({
+        yield {
             'timestamp': start_us,
             'datetime': start_iso,
             'timestamp_desc': 'Download Started',
@@ -1016,14 +1209,14 @@ def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str) -> List
             'mime_type': mime_type or "",
             'download_state': state_name,
             'referrer_url': referrer or ""
-        })
+        }
         
         # Download complete event
         if end_time and end_time != start_time:
             try:
                 end_us, end_iso = convert_gecko_timestamp(end_time)
                 duration_seconds = (end_us - start_us) / 1000000
-                rows.append({
+                yield {
                     'timestamp': end_us,
                     'datetime': end_iso,
                     'timestamp_desc': 'Download Completed',
@@ -1036,17 +1229,20 @@ def extract_gecko_downloads(conn: sqlite3.Connection, browser_name: str) -> List
                     'mime_type': mime_type or "",
                     'download_state': state_name,
                     'download_duration_seconds': duration_seconds
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_FORM_FIELDS = COMMON_FIELDS + (
+    'form_id', 'form_field_name', 'form_field_value', 'total_uses'
+)
+
+
+def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract form autofill history from Gecko database."""
-    if not table_exists(conn, 'moz_formhistory'):
-        return []
+    if 'moz_formhistory' not in schema:
+        return
     
     cursor = conn.cursor()
     
@@ -1060,24 +1256,21 @@ def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str) -> L
         lastUsed
     FROM moz_formhistory
     WHERE firstUsed IS NOT NULL
-    ORDER BY firstUsed
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         form_id, fieldname, value, times_used, first_used, last_used = row
         
         # First use event
         if first_used:
             try:
                 first_us, first_iso = convert_gecko_timestamp(first_used)
-                rows.append({
+                yield {
                     'timestamp': first_us,
                     'datetime': first_iso,
                     'timestamp_desc': 'Form Field First Used',
@@ -1088,7 +1281,7 @@ def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str) -> L
                     'form_field_name': fieldname,
                     'form_field_value': value[:50] + '...' if len(value) > 50 else value,
                     'total_uses': times_used or 0
-                })
+                }
             except TimestampValidationError:
                 pass
         
@@ -1096,7 +1289,7 @@ def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str) -> L
         if last_used and last_used != first_used:
             try:
                 last_us, last_iso = convert_gecko_timestamp(last_used)
-                rows.append({
+                yield {
                     'timestamp': last_us,
                     'datetime': last_iso,
                     'timestamp_desc': 'Form Field Last Used',
@@ -1107,24 +1300,25 @@ def extract_gecko_form_history(conn: sqlite3.Connection, browser_name: str) -> L
                     'form_field_name': fieldname,
                     'form_field_value': value[:50] + '...' if len(value) > 50 else value,
                     'total_uses': times_used or 0
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_ANNOTATION_FIELDS = COMMON_FIELDS + (
+    'annotation_id', 'annotation_name', 'annotation_content', 'url', 'title',
+    'bookmark_title'
+)
+
+
+def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract page and bookmark annotations from Gecko database."""
-    rows = []
-    
     # Page annotations
-    if table_exists(conn, 'moz_annos'):
+    if 'moz_annos' in schema:
         cursor = conn.cursor()
         query = """
         SELECT 
             a.id,
-            a.place_id,
             a.dateAdded,
             a.lastModified,
             n.name,
@@ -1135,21 +1329,19 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
         JOIN moz_anno_attributes n ON a.anno_attribute_id = n.id
         JOIN moz_places p ON a.place_id = p.id
         WHERE a.dateAdded IS NOT NULL
-        ORDER BY a.dateAdded
         """
         
         try:
             cursor.execute(query)
-            results = cursor.fetchall()
             
-            for row in results:
-                anno_id, place_id, date_added, last_modified, name, content, url, title = row
+            for row in cursor:
+                anno_id, date_added, last_modified, name, content, url, title = row
                 
                 # Annotation added
                 if date_added:
                     try:
                         added_us, added_iso = convert_gecko_timestamp(date_added)
-                        rows.append({
+                        yield {
                             'timestamp': added_us,
                             'datetime': added_iso,
                             'timestamp_desc': 'Page Annotation Added',
@@ -1161,7 +1353,7 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                             'annotation_content': content[:100] + '...' if content and len(content) > 100 else content,
                             'url': url or "",
                             'title': title or ""
-                        })
+                        }
                     except TimestampValidationError:
                         pass
                 
@@ -1169,7 +1361,7 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                 if last_modified and last_modified != date_added:
                     try:
                         modified_us, modified_iso = convert_gecko_timestamp(last_modified)
-                        rows.append({
+                        yield {
                             'timestamp': modified_us,
                             'datetime': modified_iso,
                             'timestamp_desc': 'Page Annotation Modified',
@@ -1179,19 +1371,18 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                             'annotation_id': anno_id,
                             'annotation_name': name,
                             'url': url or ""
-                        })
+                        }
                     except TimestampValidationError:
                         pass
         except sqlite3.Error:
             pass
     
     # Bookmark annotations
-    if table_exists(conn, 'moz_items_annos'):
+    if 'moz_items_annos' in schema:
         cursor = conn.cursor()
         query = """
         SELECT 
             ia.id,
-            ia.item_id,
             ia.dateAdded,
             ia.lastModified,
             n.name,
@@ -1201,21 +1392,19 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
         JOIN moz_anno_attributes n ON ia.anno_attribute_id = n.id
         JOIN moz_bookmarks b ON ia.item_id = b.id
         WHERE ia.dateAdded IS NOT NULL
-        ORDER BY ia.dateAdded
         """
         
         try:
             cursor.execute(query)
-            results = cursor.fetchall()
             
-            for row in results:
-                anno_id, item_id, date_added, last_modified, name, content, title = row
+            for row in cursor:
+                anno_id, date_added, last_modified, name, content, title = row
                 
                 # Annotation added
                 if date_added:
                     try:
                         added_us, added_iso = convert_gecko_timestamp(date_added)
-                        rows.append({
+                        yield {
                             'timestamp': added_us,
                             'datetime': added_iso,
                             'timestamp_desc': 'Bookmark Annotation Added',
@@ -1226,7 +1415,7 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                             'annotation_name': name,
                             'annotation_content': content[:100] + '...' if content and len(content) > 100 else content,
                             'bookmark_title': title or ""
-                        })
+                        }
                     except TimestampValidationError:
                         pass
                 
@@ -1234,7 +1423,7 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                 if last_modified and last_modified != date_added:
                     try:
                         modified_us, modified_iso = convert_gecko_timestamp(last_modified)
-                        rows.append({
+                        yield {
                             'timestamp': modified_us,
                             'datetime': modified_iso,
                             'timestamp_desc': 'Bookmark Annotation Modified',
@@ -1243,27 +1432,30 @@ def extract_gecko_annotations(conn: sqlite3.Connection, browser_name: str) -> Li
                             'browser': browser_name,
                             'annotation_id': anno_id,
                             'annotation_name': name
-                        })
+                        }
                     except TimestampValidationError:
                         pass
         except sqlite3.Error:
             pass
-    
-    return rows
 
 
-def extract_gecko_metadata(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_METADATA_FIELDS = COMMON_FIELDS + (
+    'url', 'title', 'total_view_time_seconds', 'typing_time_seconds',
+    'key_presses', 'scrolling_time_seconds', 'scrolling_distance',
+    'document_type'
+)
+
+
+def extract_gecko_metadata(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract page metadata/engagement events from Gecko database."""
-    if not table_exists(conn, 'moz_places_metadata'):
-        return []
+    if 'moz_places_metadata' not in schema:
+        return
     
     cursor = conn.cursor()
     
     query = """
     SELECT 
-        m.place_id,
         m.created_at,
-        m.updated_at,
         m.total_view_time,
         m.typing_time,
         m.key_presses,
@@ -1275,20 +1467,16 @@ def extract_gecko_metadata(conn: sqlite3.Connection, browser_name: str) -> List[
     FROM moz_places_metadata m
     JOIN moz_places p ON m.place_id = p.id
     WHERE m.created_at > 0
-    ORDER BY m.created_at
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
-        (place_id, created_at, updated_at, total_view_time, typing_time,
-         key_presses, scrolling_time, scrolling_distance, document_type,
-         url, title) = row
+    for row in cursor:
+        (created_at, total_view_time, typing_time, key_presses,
+         scrolling_time, scrolling_distance, document_type, url, title) = row
         
         try:
             created_us, created_iso = convert_gecko_timestamp(created_at)
@@ -1299,37 +1487,40 @@ def extract_gecko_metadata(conn: sqlite3.Connection, browser_name: str) -> List[
         view_seconds = (total_view_time or 0) / 1000000
         typing_seconds = (typing_time or 0) / 1000000
         scrolling_seconds = (scrolling_time or 0) / 1000000
+        display_title = title or NO_TITLE
         
-        rows.append({
+        yield {
             'timestamp': created_us,
             'datetime': created_iso,
             'timestamp_desc': 'Page Engagement',
-            'message': f"Engaged with: {title or '(No title)'} ({view_seconds:.1f}s)",
+            'message': f"Engaged with: {display_title} ({view_seconds:.1f}s)",
             'data_type': 'browser:page:engagement',
             'browser': browser_name,
             'url': url or "",
-            'title': title or "(No title)",
+            'title': display_title,
             'total_view_time_seconds': view_seconds,
             'typing_time_seconds': typing_seconds,
             'key_presses': key_presses or 0,
             'scrolling_time_seconds': scrolling_seconds,
             'scrolling_distance': scrolling_distance or 0,
             'document_type': document_type
-        })
-    
-    return rows
+        }
 
 
-def extract_gecko_input_history(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_INPUT_FIELDS = COMMON_FIELDS + (
+    'input_text', 'matched_url', 'matched_title', 'use_count'
+)
+
+
+def extract_gecko_input_history(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract address bar input history from Gecko database."""
-    if not table_exists(conn, 'moz_inputhistory'):
-        return []
+    if 'moz_inputhistory' not in schema:
+        return
     
     cursor = conn.cursor()
     
     query = """
     SELECT 
-        ih.place_id,
         ih.input,
         ih.use_count,
         p.url,
@@ -1343,20 +1534,18 @@ def extract_gecko_input_history(conn: sqlite3.Connection, browser_name: str) ->
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
-        place_id, input_text, use_count, url, title, last_visit = row
+    for row in cursor:
+        input_text, use_count, url, title, last_visit = row
         
         try:
             unix_microseconds, iso_datetime = convert_gecko_timestamp(last_visit)
         except TimestampValidationError:
             continue
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Address Bar Input',
@@ -1367,21 +1556,24 @@ def extract_gecko_input_history(conn: sqlite3.Connection, browser_name: str) ->
             'matched_url': url or "",
             'matched_title': title or "",
             'use_count': use_count or 0
-        })
-    
-    return rows
+        }
+
 
+GECKO_KEYWORD_FIELDS = COMMON_FIELDS + (
+    'keyword_id', 'keyword', 'search_url', 'title'
+)
 
-def extract_gecko_keywords(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+
+def extract_gecko_keywords(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract custom search keywords from Gecko database."""
-    if not table_exists(conn, 'moz_keywords'):
-        return []
+    if 'moz_keywords' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check if dateAdded column exists (not in all Firefox versions)
-    if not column_exists(conn, 'moz_keywords', 'dateAdded'):
-        return []
+    if 'dateAdded' not in schema['moz_keywords']:
+        return
     
     query = """
     SELECT 
@@ -1393,17 +1585,14 @@ def extract_gecko_keywords(conn: sqlite3.Connection, browser_name: str) -> List[
     FROM moz_keywords k
     LEFT JOIN moz_places p ON k.place_id = p.id
     WHERE k.dateAdded IS NOT NULL
-    ORDER BY k.dateAdded
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         keyword_id, keyword, date_added, url, title = row
         
         try:
@@ -1411,7 +1600,7 @@ def extract_gecko_keywords(conn: sqlite3.Connection, browser_name: str) -> List[
         except TimestampValidationError:
             continue
         
-        rows.append({
+        yield {
             'timestamp': added_us,
             'datetime': added_iso,
             'timestamp_desc': 'Keyword Added',
@@ -1422,43 +1611,42 @@ def extract_gecko_keywords(conn: sqlite3.Connection, browser_name: str) -> List[
             'keyword': keyword or "",
             'search_url': url or "",
             'title': title or ""
-        })
-    
-    return rows
+        }
 
 
-def extract_gecko_origins(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+GECKO_ORIGIN_FIELDS = COMMON_FIELDS + (
+    'origin', 'host', 'prefix', 'frecency_score'
+)
+
+
+def extract_gecko_origins(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract origin (domain) tracking data from Gecko database."""
-    if not table_exists(conn, 'moz_origins'):
-        return []
+    if 'moz_origins' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for last_visit_date column
-    if not column_exists(conn, 'moz_origins', 'last_visit_date'):
-        return []
+    if 'last_visit_date' not in schema['moz_origins']:
+        return
     
     query = """
     SELECT 
-        id,
         prefix,
         host,
         frecency,
         last_visit_date
     FROM moz_origins
     WHERE last_visit_date IS NOT NULL
-    ORDER BY last_visit_date
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
-        origin_id, prefix, host, frecency, last_visit = row
+    for row in cursor:
+        prefix, host, frecency, last_visit = row
         
         try:
             unix_microseconds, iso_datetime = convert_gecko_timestamp(last_visit)
@@ -1467,7 +1655,7 @@ def extract_gecko_origins(conn: sqlite3.Connection, browser_name: str) -> List[D
         
         full_origin = f"{prefix}{host}" if prefix else host
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Domain Visited',
@@ -1478,28 +1666,31 @@ def extract_gecko_origins(conn: sqlite3.Connection, browser_name: str) -> List[D
             'host': host or "",
             'prefix': prefix or "",
             'frecency_score': frecency or 0
-        })
-    
-    return rows
+        }
 
 
 # ============================================================================
 # WEBKIT/SAFARI EXTRACTORS
 # ============================================================================
 
-def extract_webkit_visits(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+WEBKIT_VISIT_FIELDS = COMMON_FIELDS + (
+    'url', 'title', 'load_successful', 'http_post', 'total_visit_count',
+    'redirect_source_url', 'redirect_destination_url'
+)
+
+
+def extract_webkit_visits(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract visit events from WebKit database with resolved redirect chains."""
     cursor = conn.cursor()
     
     query = """
     SELECT 
         hv.visit_time,
-        hi.url,
-        hi.title,
-        hv.title as visit_title,
+        COALESCE(hi.url, ''),
+        COALESCE(NULLIF(hi.title, ''), NULLIF(hv.title, ''), ?),
         hv.load_successful,
         hv.http_non_get,
-        hi.visit_count,
+        COALESCE(hi.visit_count, 0),
         redirect_src_items.url as redirect_source_url,
         redirect_dst_items.url as redirect_destination_url
     FROM history_visits hv
@@ -1508,24 +1699,23 @@ def extract_webkit_visits(conn: sqlite3.Connection, browser_name: str) -> List[D
     LEFT JOIN history_items redirect_src_items ON redirect_src.history_item = redirect_src_items.id
     LEFT JOIN history_visits redirect_dst ON hv.redirect_destination = redirect_dst.id
     LEFT JOIN history_items redirect_dst_items ON redirect_dst.history_item = redirect_dst_items.id
-    ORDER BY hv.visit_time
+    WHERE hv.visit_time IS NULL OR hv.visit_time = 0
+       OR hv.visit_time BETWEEN ? AND ?
+    ORDER BY (hv.visit_time IS NOT NULL AND hv.visit_time <> 0), hv.visit_time
     """
     
-    cursor.execute(query)
-    results = cursor.fetchall()
+    # URL/title/count defaults are filled in by the query. Rows are merged by
+    # converted timestamp: NULL/0 become Unix 0 and sort first, while raw
+    # negative values (before 2001) are still after 1990 and sort by value.
+    cursor.execute(query, (NO_TITLE, WEBKIT_MIN_TIMESTAMP, WEBKIT_MAX_TIMESTAMP))
     
-    rows = []
-    for row in results:
-        (webkit_timestamp, url, title, visit_title,
+    for row in cursor:
+        (webkit_timestamp, url, display_title,
          load_successful, http_non_get, visit_count,
          redirect_source_url, redirect_destination_url) = row
         
-        try:
-            unix_microseconds, iso_datetime = convert_webkit_timestamp(webkit_timestamp)
-        except TimestampValidationError:
-            continue
-        
-        display_title = title or visit_title or "(No title)"
+        # Out-of-range timestamps are already filtered out by the query
+        unix_microseconds, iso_datetime = convert_webkit_timestamp(webkit_timestamp)
         
         message = f"Visited: {display_title}"
         if not load_successful:
@@ -1537,15 +1727,15 @@ def extract_webkit_visits(conn: sqlite3.Connection, browser_name: str) -> List[D
         row_data = {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
-            'timestamp_desc': 'Visit Time',
+            'timestamp_desc': VISIT_TIMESTAMP_DESC,
             'message': message,
-            'data_type': 'browser:page:visit',
+            'data_type': VISIT_DATA_TYPE,
             'browser': browser_name,
-            'url': url or "",
+            'url': url,
             'title': display_title,
             'load_successful': bool(load_successful),
             'http_post': bool(http_non_get),
-            'total_visit_count': visit_count or 0
+            'total_visit_count': visit_count
         }
         
         # Add redirect chain info if present
@@ -1554,21 +1744,24 @@ def extract_webkit_visits(conn: sqlite3.Connection, browser_name: str) -> List[D
         if redirect_destination_url:
             row_data['redirect_destination_url'] = redirect_destination_url
         
-        rows.append(row_data)
-    
-    return rows
+        yield row_data
+
 
+WEBKIT_BOOKMARK_FIELDS = COMMON_FIELDS + (
+    'bookmark_id', 'bookmark_title', 'url'
+)
 
-def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+
+def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract bookmarks from WebKit database."""
-    if not table_exists(conn, 'bookmarks'):
-        return []
+    if 'bookmarks' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for date_added column
-    if not column_exists(conn, 'bookmarks', 'date_added'):
-        return []
+    if 'date_added' not in schema['bookmarks']:
+        return
     
     query = """
     SELECT 
@@ -1579,24 +1772,21 @@ def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str) -> Lis
         date_last_modified
     FROM bookmarks
     WHERE date_added > 0
-    ORDER BY date_added
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         bm_id, title, url, date_added, date_modified = row
         
         # Bookmark added
         if date_added:
             try:
                 added_us, added_iso = convert_webkit_timestamp(date_added)
-                rows.append({
+                yield {
                     'timestamp': added_us,
                     'datetime': added_iso,
                     'timestamp_desc': 'Bookmark Added',
@@ -1606,7 +1796,7 @@ def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str) -> Lis
                     'bookmark_id': bm_id,
                     'bookmark_title': title or "",
                     'url': url or ""
-                })
+                }
             except TimestampValidationError:
                 pass
         
@@ -1614,7 +1804,7 @@ def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str) -> Lis
         if date_modified and date_modified != date_added:
             try:
                 modified_us, modified_iso = convert_webkit_timestamp(date_modified)
-                rows.append({
+                yield {
                     'timestamp': modified_us,
                     'datetime': modified_iso,
                     'timestamp_desc': 'Bookmark Modified',
@@ -1624,23 +1814,27 @@ def extract_webkit_bookmarks(conn: sqlite3.Connection, browser_name: str) -> Lis
                     'bookmark_id': bm_id,
                     'bookmark_title': title or "",
                     'url': url or ""
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+WEBKIT_DOWNLOAD_FIELDS = COMMON_FIELDS + (
+    'download_id', 'filename', 'source_url', 'file_path', 'file_size_bytes',
+    'mime_type', 'download_duration_seconds'
+)
+
+
+def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract downloads from WebKit database."""
-    if not table_exists(conn, 'downloads'):
-        return []
+    if 'downloads' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for date_started column
-    if not column_exists(conn, 'downloads', 'date_started'):
-        return []
+    if 'date_started' not in schema['downloads']:
+        return
     
     query = """
     SELECT 
@@ -1654,26 +1848,23 @@ def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str) -> Lis
         date_finished
     FROM downloads
     WHERE date_started > 0
-    ORDER BY date_started
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         dl_id, url, path, mime_type, bytes_received, total_bytes, date_started, date_finished = row
         
-        filename = Path(path).name if path else "(unknown)"
+        filename = download_filename(path)
         
         # Download started
         if date_started:
             try:
                 started_us, started_iso = convert_webkit_timestamp(date_started)
-                rows.append({
+                yield {
                     'timestamp': started_us,
                     'datetime': started_iso,
                     'timestamp_desc': 'Download Started',
@@ -1686,7 +1877,7 @@ def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str) -> Lis
                     'file_path': path or "",
                     'file_size_bytes': total_bytes or 0,
                     'mime_type': mime_type or ""
-                })
+                }
             except TimestampValidationError:
                 pass
         
@@ -1695,7 +1886,7 @@ def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str) -> Lis
             try:
                 finished_us, finished_iso = convert_webkit_timestamp(date_finished)
                 duration_seconds = (finished_us - started_us) / 1000000 if date_started else 0
-                rows.append({
+                yield {
                     'timestamp': finished_us,
                     'datetime': finished_iso,
                     'timestamp_desc': 'Download Completed',
@@ -1708,23 +1899,26 @@ def extract_webkit_downloads(conn: sqlite3.Connection, browser_name: str) -> Lis
                     'file_size_bytes': bytes_received or 0,
                     'mime_type': mime_type or "",
                     'download_duration_seconds': duration_seconds
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+WEBKIT_READING_LIST_FIELDS = COMMON_FIELDS + (
+    'reading_list_id', 'title', 'url'
+)
+
+
+def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract Reading List items from WebKit database."""
-    if not table_exists(conn, 'reading_list'):
-        return []
+    if 'reading_list' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for date_added column
-    if not column_exists(conn, 'reading_list', 'date_added'):
-        return []
+    if 'date_added' not in schema['reading_list']:
+        return
     
     query = """
     SELECT 
@@ -1735,24 +1929,21 @@ def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str) ->
         date_last_viewed
     FROM reading_list
     WHERE date_added > 0
-    ORDER BY date_added
     """
     
     try:
         cursor.execute(query)
-        results = cursor.fetchall()
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         item_id, title, url, date_added, date_viewed = row
         
         # Reading list item added
         if date_added:
             try:
                 added_us, added_iso = convert_webkit_timestamp(date_added)
-                rows.append({
+                yield {
                     'timestamp': added_us,
                     'datetime': added_iso,
                     'timestamp_desc': 'Reading List Item Added',
@@ -1762,7 +1953,7 @@ def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str) ->
                     'reading_list_id': item_id,
                     'title': title or "",
                     'url': url or ""
-                })
+                }
             except TimestampValidationError:
                 pass
         
@@ -1770,7 +1961,7 @@ def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str) ->
         if date_viewed and date_viewed > 0:
             try:
                 viewed_us, viewed_iso = convert_webkit_timestamp(date_viewed)
-                rows.append({
+                yield {
                     'timestamp': viewed_us,
                     'datetime': viewed_iso,
                     'timestamp_desc': 'Reading List Item Viewed',
@@ -1780,23 +1971,26 @@ def extract_webkit_reading_list(conn: sqlite3.Connection, browser_name: str) ->
                     'reading_list_id': item_id,
                     'title': title or "",
                     'url': url or ""
-                })
+                }
             except TimestampValidationError:
                 pass
-    
-    return rows
 
 
-def extract_webkit_top_sites(conn: sqlite3.Connection, browser_name: str) -> List[Dict[str, Any]]:
+WEBKIT_TOP_SITE_FIELDS = COMMON_FIELDS + (
+    'site_id', 'url', 'title', 'visit_count'
+)
+
+
+def extract_webkit_top_sites(conn: sqlite3.Connection, browser_name: str, schema: Dict[str, Set[str]]) -> Iterator[Dict[str, Any]]:
     """Extract Top Sites data from WebKit database."""
-    if not table_exists(conn, 'top_sites'):
-        return []
+    if 'top_sites' not in schema:
+        return
     
     cursor = conn.cursor()
     
     # Check for last_visited column
-    if not column_exists(conn, 'top_sites', 'last_visited'):
-        return []
+    if 'last_visited' not in schema['top_sites']:
+        return
     
     query = """
     SELECT 
@@ -1806,26 +2000,20 @@ def extract_webkit_top_sites(conn: sqlite3.Connection, browser_name: str) -> Lis
         visit_count,
         last_visited
     FROM top_sites
-    WHERE last_visited > 0
-    ORDER BY last_visited
+    WHERE last_visited > 0 AND last_visited <= ?
     """
     
     try:
-        cursor.execute(query)
-        results = cursor.fetchall()
+        cursor.execute(query, (WEBKIT_MAX_TIMESTAMP,))
     except sqlite3.Error:
-        return []
+        return
     
-    rows = []
-    for row in results:
+    for row in cursor:
         site_id, url, title, visit_count, last_visited = row
         
-        try:
-            unix_microseconds, iso_datetime = convert_webkit_timestamp(last_visited)
-        except TimestampValidationError:
-            continue
+        unix_microseconds, iso_datetime = convert_webkit_timestamp(last_visited)
         
-        rows.append({
+        yield {
             'timestamp': unix_microseconds,
             'datetime': iso_datetime,
             'timestamp_desc': 'Top Site Last Visited',
@@ -1836,110 +2024,170 @@ def extract_webkit_top_sites(conn: sqlite3.Connection, browser_name: str) -> Lis
             'url': url or "",
             'title': title or "",
             'visit_count': visit_count or 0
-        })
-    
-    return rows
+        }
 
 
 # ============================================================================
 # MAIN EXTRACTION ORCHESTRATION
 # ============================================================================
 
-def extract_all_events(db_path: str, browser_type: str, browser_name: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+# Extractors run for each browser type, in reporting order.
+# Each entry: (label, extractor, output fields, rows are yielded in timestamp order)
+BROWSER_EXTRACTORS = {
+    'gecko': (
+        ('Page Visits', extract_gecko_visits, GECKO_VISIT_FIELDS, True),
+        ('Bookmarks', extract_gecko_bookmarks, GECKO_BOOKMARK_FIELDS, False),
+        ('Downloads', extract_gecko_downloads, GECKO_DOWNLOAD_FIELDS, False),
+        ('Form History', extract_gecko_form_history, GECKO_FORM_FIELDS, False),
+        ('Annotations', extract_gecko_annotations, GECKO_ANNOTATION_FIELDS, False),
+        ('Page Engagement', extract_gecko_metadata, GECKO_METADATA_FIELDS, False),
+        ('Address Bar Input', extract_gecko_input_history, GECKO_INPUT_FIELDS, True),
+        ('Search Keywords', extract_gecko_keywords, GECKO_KEYWORD_FIELDS, False),
+        ('Domain Tracking', extract_gecko_origins, GECKO_ORIGIN_FIELDS, False),
+    ),
+    'chromium': (
+        ('Page Visits', extract_chromium_visits, CHROMIUM_VISIT_FIELDS, True),
+        ('Downloads', extract_chromium_downloads, CHROMIUM_DOWNLOAD_FIELDS, False),
+        ('Search Queries', extract_chromium_search_terms, CHROMIUM_SEARCH_FIELDS, False),
+        ('Form Autofill', extract_chromium_autofill, CHROMIUM_AUTOFILL_FIELDS, False),
+        ('Favicons', extract_chromium_favicons, CHROMIUM_FAVICON_FIELDS, False),
+        ('Media Playback', extract_chromium_media_history, CHROMIUM_MEDIA_FIELDS, False),
+        ('Site Engagement', extract_chromium_site_engagement, CHROMIUM_ENGAGEMENT_FIELDS, False),
+    ),
+    'webkit': (
+        ('Page Visits', extract_webkit_visits, WEBKIT_VISIT_FIELDS, True),
+        ('Bookmarks', extract_webkit_bookmarks, WEBKIT_BOOKMARK_FIELDS, False),
+        ('Downloads', extract_webkit_downloads, WEBKIT_DOWNLOAD_FIELDS, False),
+        ('Reading List', extract_webkit_reading_list, WEBKIT_READING_LIST_FIELDS, False),
+        ('Top Sites', extract_webkit_top_sites, WEBKIT_TOP_SITE_FIELDS, False),
+    ),
+}
+
+# Value of the browser column when --browser-name is not given
+BROWSER_DISPLAY_NAMES = {'gecko': 'Firefox', 'chromium': 'Chromium', 'webkit': 'Safari'}
+
+# Browser names looked for in the input path to name the default output file
+OUTPUT_BROWSER_NAMES = ('firefox', 'chrome', 'edge', 'brave', 'opera', 'vivaldi', 'safari')
+
+
+def silent(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for print() that discards status output in --quiet mode."""
+
+
+def count_events(name: str, events: Iterable[Dict[str, Any]], event_counts: Dict[str, int],
+                 incomplete: Set[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Pass event rows through, recording how many were produced under name.
+    
+    An error raised while the extractor is being consumed is reported and
+    ends only that extractor's stream. Rows yielded before the error have
+    already been written, so name is added to incomplete to flag the
+    partial count in the summary.
+    """
+    count = 0
+    try:
+        for count, row in enumerate(events, 1):
+            yield row
+    except Exception as e:
+        incomplete.add(name)
+        # Leading newline: this can fire mid-write, after an unterminated progress line
+        print(f"\n  ✗ {name:25} Error: {e} (stopped after {count:,} events)", file=sys.stderr)
+    finally:
+        event_counts[name] = count
+
+
+def collect_sorted_events(db_path: str, extractor_func, browser_name: str, schema: Dict[str, Set[str]]) -> List[Dict[str, Any]]:
+    """Run one extractor on its own read-only connection and return its rows sorted by timestamp."""
+    conn = connect_database_readonly(db_path)
+    try:
+        return sorted(extractor_func(conn, browser_name, schema), key=timestamp_key)
+    finally:
+        conn.close()
+
+
+def extract_all_events(conn: sqlite3.Connection, db_path: str, browser_type: str, browser_name: Optional[str] = None, quiet: bool = False) -> Tuple[Iterator[Dict[str, Any]], List[str], Dict[str, int], Set[str]]:
     """
     Extract ALL timeline events from browser database.
     
+    Extractors are generators, so rows are produced while the returned
+    iterator is consumed. event_counts is filled in as each extractor's
+    stream is exhausted. conn is owned by the caller and must stay open
+    until the iterator is exhausted; db_path is used to open the extra
+    connections for background extractors. quiet suppresses the
+    per-extractor status lines but not error messages.
+    
     Returns:
-        Tuple of (all_rows, event_counts dictionary)
+        Tuple of (timestamp-ordered row iterator, CSV fieldnames, event_counts
+        dictionary, names of extractors that failed part-way through their rows).
+        fieldnames is empty if no extractor found any events; the incomplete
+        set is only final once the iterator is exhausted.
     """
     if browser_name is None:
-        browser_name = {'gecko': 'Firefox', 'chromium': 'Chromium', 'webkit': 'Safari'}[browser_type]
+        browser_name = BROWSER_DISPLAY_NAMES[browser_type]
     
-    conn = connect_database_readonly(db_path)
-    all_rows = []
+    streams = []
     event_counts = {}
+    incomplete = set()
+    all_fields = set()
     
-    print(f"Extracting events from {browser_name} database...")
-    print("=" * 60)
+    log = silent if quiet else print
     
-    try:
-        if browser_type == 'gecko':
-            # Firefox/Gecko - extract all event types
-            extractors = [
-                ('Page Visits', extract_gecko_visits),
-                ('Bookmarks', extract_gecko_bookmarks),
-                ('Downloads', extract_gecko_downloads),
-                ('Form History', extract_gecko_form_history),
-                ('Annotations', extract_gecko_annotations),
-                ('Page Engagement', extract_gecko_metadata),
-                ('Address Bar Input', extract_gecko_input_history),
-                ('Search Keywords', extract_gecko_keywords),
-                ('Domain Tracking', extract_gecko_origins),
-            ]
-            
-        elif browser_type == 'chromium':
-            # Chromium - extract all event types
-            extractors = [
-                ('Page Visits', extract_chromium_visits),
-                ('Downloads', extract_chromium_downloads),
-                ('Search Queries', extract_chromium_search_terms),
-                ('Form Autofill', extract_chromium_autofill),
-                ('Favicons', extract_chromium_favicons),
-                ('Media Playback', extract_chromium_media_history),
-                ('Site Engagement', extract_chromium_site_engagement),
-            ]
-            
-        elif browser_type == 'webkit':
-            # Safari/WebKit - extract all event types
-            extractors = [
-                ('Page Visits', extract_webkit_visits),
-                ('Bookmarks', extract_webkit_bookmarks),
-                ('Downloads', extract_webkit_downloads),
-                ('Reading List', extract_webkit_reading_list),
-                ('Top Sites', extract_webkit_top_sites),
-            ]
-        
-        # Run all extractors
-        for name, extractor_func in extractors:
+    log(f"Extracting events from {browser_name} database...")
+    log("=" * 60)
+    
+    extractors = BROWSER_EXTRACTORS[browser_type]
+    
+    schema = load_schema(conn)
+    
+    with ThreadPoolExecutor(max_workers=EXTRACTOR_THREADS) as executor:
+        # Unordered output is from small tables: collect and sort each one on
+        # its own connection in the background while the ordered streams start
+        pending = {
+            name: executor.submit(collect_sorted_events, db_path, extractor_func, browser_name, schema)
+            for name, extractor_func, fields, ordered in extractors
+            if not ordered
+        }
+        
+        # Start all extractors
+        for name, extractor_func, fields, ordered in extractors:
+            event_counts[name] = 0
             try:
-                events = extractor_func(conn, browser_name)
-                all_rows.extend(events)
-                event_counts[name] = len(events)
-                print(f"  ✓ {name:25} {len(events):>7,} events")
+                if ordered:
+                    events = extractor_func(conn, browser_name, schema)
+                    # Peek at the first row so empty extractors add no columns
+                    first = next(events, None)
+                    found = first is not None
+                    events = chain([first], events)
+                else:
+                    events = pending[name].result()
+                    found = bool(events)
             except Exception as e:
-                print(f"  ✗ {name:25} Error: {e}")
-                event_counts[name] = 0
-        
-    finally:
-        conn.close()
+                print(f"  ✗ {name:25} Error: {e}", file=sys.stderr)
+                continue
+            
+            if not found:
+                log(f"  - {name:25} no events")
+                continue
+            
+            log(f"  ✓ {name}")
+            all_fields.update(fields)
+            streams.append(count_events(name, events, event_counts, incomplete))
     
-    # Sort all events by timestamp
-    all_rows.sort(key=lambda x: x['timestamp'])
+    log("=" * 60)
     
-    print("=" * 60)
+    if not streams:
+        return iter(()), [], event_counts, incomplete
     
-    return all_rows, event_counts
+    # Lazily merge the per-extractor timelines into one sorted by timestamp
+    return heapq.merge(*streams, key=timestamp_key), build_fieldnames(all_fields), event_counts, incomplete
 
 
 def generate_default_output_filename(browser_type: str, input_path: str) -> str:
     """Generate a sensible default output filename based on browser type and input."""
     path_lower = input_path.lower()
     
-    browser_names = {
-        'firefox': 'firefox', 'chrome': 'chrome', 'edge': 'edge',
-        'brave': 'brave', 'opera': 'opera', 'vivaldi': 'vivaldi', 'safari': 'safari',
-    }
-    
-    detected_name = None
-    for name_key, name_value in browser_names.items():
-        if name_key in path_lower:
-            detected_name = name_value
-            break
-    
-    if detected_name:
-        return f"{detected_name}_timeline_timesketch.csv"
-    else:
-        return f"{browser_type}_timeline_timesketch.csv"
+    detected_name = next((name for name in OUTPUT_BROWSER_NAMES if name in path_lower), browser_type)
+    return f"{detected_name}_timeline_timesketch.csv"
 
 
 def main() -> int:
@@ -2014,7 +2262,13 @@ Example usage:
     
     parser.add_argument(
         '-o', '--output',
-        help='Output CSV file path (default: auto-generated)'
+        help='Output CSV file path; a .gz or .zst suffix compresses it (default: auto-generated)'
+    )
+    
+    parser.add_argument(
+        '--compress',
+        choices=['none', 'gz', 'zst'],
+        help='Compress the output CSV (default: inferred from the output file extension)'
     )
     
     parser.add_argument(
@@ -2022,65 +2276,125 @@ Example usage:
         help='Custom browser name for the browser field (e.g., "Brave", "Edge")'
     )
     
+    parser.add_argument(
+        '-y', '--yes',
+        action='store_true',
+        help='Continue without asking if the database does not match --browser'
+    )
+    
+    parser.add_argument(
+        '-q', '--quiet',
+        action='store_true',
+        help='Only print warnings and errors'
+    )
+    
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+        help='Print a full traceback for unexpected errors'
+    )
+    
     args = parser.parse_args()
+    log = silent if args.quiet else print
+    conn = None
     
     try:
-        # Validate database file
-        print(f"Validating database: {args.input}")
-        validate_sqlite_database(args.input)
-        print("✓ Database is valid SQLite file\n")
+        # Validate database file; the connection is reused for every later step
+        log(f"Validating database: {args.input}")
+        conn = validate_sqlite_database(args.input)
+        log("✓ Database is valid SQLite file\n")
         
         # Detect or validate browser type
         browser_type = args.browser.lower()
         
         if browser_type == 'auto':
-            print("Auto-detecting browser type...")
-            browser_type = detect_browser_type(args.input)
-            print(f"✓ Detected browser type: {browser_type}\n")
+            log("Auto-detecting browser type...")
+            browser_type = detect_browser_type(conn)
+            log(f"✓ Detected browser type: {browser_type}\n")
         else:
             if browser_type == 'firefox':
                 browser_type = 'gecko'
             elif browser_type == 'safari':
                 browser_type = 'webkit'
             
-            detected_type = detect_browser_type(args.input)
+            detected_type = detect_browser_type(conn)
             if detected_type != browser_type:
                 print(f"Warning: You specified '{args.browser}' but database appears to be '{detected_type}'", 
                       file=sys.stderr)
-                response = input("Continue anyway? [y/N]: ")
-                if response.lower() != 'y':
-                    return 1
+                if not args.yes:
+                    # Never block a scripted run on a prompt nobody can answer
+                    if not sys.stdin.isatty():
+                        print("Refusing to continue without --yes (no terminal to confirm on)", file=sys.stderr)
+                        return 1
+                    response = input("Continue anyway? [y/N]: ")
+                    if response.lower() != 'y':
+                        return 1
         
         # Generate output filename if not provided
         if args.output:
             output_csv = args.output
         else:
             output_csv = generate_default_output_filename(browser_type, args.input)
-            print(f"Using output filename: {output_csv}\n")
+        
+        # An explicit --compress wins over the extension and adds its suffix if missing
+        extension_compression = output_compression(output_csv)
+        compression = args.compress or extension_compression
+        if extension_compression not in ('none', compression):
+            print(f"Warning: --compress {compression} does not match the "
+                  f"'{COMPRESSION_SUFFIXES[extension_compression]}' extension of {output_csv}",
+                  file=sys.stderr)
+        
+        suffix = COMPRESSION_SUFFIXES.get(compression)
+        renamed = bool(args.compress and suffix and not output_csv.endswith(suffix))
+        if renamed:
+            output_csv += suffix
+        
+        if renamed or not args.output:
+            log(f"Using output filename: {output_csv}\n")
+        
+        if compression == 'zst' and zstandard is None:
+            print("\n❌ Writing .zst output requires the 'zstandard' package (pip install zstandard)",
+                  file=sys.stderr)
+            return 1
         
         # Extract all events
-        all_rows, event_counts = extract_all_events(args.input, browser_type, args.browser_name)
+        rows, fieldnames, event_counts, incomplete = extract_all_events(conn, args.input, browser_type, args.browser_name, args.quiet)
         
-        if not all_rows:
+        # No fieldnames means no extractor found anything
+        if not fieldnames:
             print("\n❌ No events found in database!")
             return 1
         
-        # Write to CSV
-        print(f"\nWriting {len(all_rows):,} total events to CSV...")
-        write_timesketch_csv(output_csv, all_rows)
-        
-        # Summary
-        print("\n" + "=" * 60)
-        print("EXTRACTION COMPLETE")
-        print("=" * 60)
-        print(f"Total events:  {len(all_rows):,}")
-        print("\nEvent breakdown:")
-        for event_type, count in sorted(event_counts.items()):
-            if count > 0:
-                print(f"  • {event_type:25} {count:>7,} events")
-        print(f"\n✓ Output saved to: {output_csv}")
-        print(f"✓ Format: Browser-agnostic Timesketch CSV")
-        print("=" * 60)
+        # Write to CSV (extraction happens while rows are written)
+        log("\nWriting events to CSV...")
+        progress = None
+        if not args.quiet and sys.stdout.isatty():
+            def progress(written: int) -> None:
+                # Redraw one line in place; the summary below starts on a fresh line
+                sys.stdout.write(f"\r  {written:,} events written...")
+                sys.stdout.flush()
+        write_timesketch_csv(output_csv, rows, fieldnames, compression, progress)
+        total_events = sum(event_counts.values())
+        
+        # Summary, emitted as a single write
+        summary = [
+            "\n" + "=" * 60,
+            "EXTRACTION COMPLETE",
+            "=" * 60,
+            f"Total events:  {total_events:,}",
+            "\nEvent breakdown:",
+        ]
+        summary.extend(
+            f"  • {event_type:25} {count:>7,} events" + (" (incomplete)" if event_type in incomplete else "")
+            for event_type, count in sorted(event_counts.items())
+            if count > 0 or event_type in incomplete
+        )
+        summary += [
+            f"\n✓ Output saved to: {output_csv}",
+            "✓ Format: Browser-agnostic Timesketch CSV",
+            "=" * 60,
+        ]
+        log("\n".join(summary))
         
         return 0
         
@@ -2097,10 +2411,16 @@ Example usage:
         print("\n\n⚠️  Operation cancelled by user", file=sys.stderr)
         return 130
     except Exception as e:
-        print(f"\n❌ Unexpected Error: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ Unexpected Error: {type(e).__name__}: {e}", file=sys.stderr)
+        if args.debug:
+            import traceback
+            traceback.print_exc()
+        else:
+            print("Run again with --debug for a full traceback.", file=sys.stderr)
         return 1
+    finally:
+        if conn is not None:
+            conn.close()
 
 
 if __name__ == "__main__":